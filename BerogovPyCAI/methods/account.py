@@ -1,5 +1,6 @@
+import asyncio
+import time
 import uuid
-import json
 from typing import List, Dict, Union
 
 from ..types import Account, Persona, CharacterShort, Voice
@@ -10,16 +11,68 @@ from ..exceptions import (
 
 from ..requester import Requester
 
+try:
+    from blake3 import blake3 as _hash_body
+except ImportError:
+    from hashlib import blake2b as _hash_body
+
+_URL_USER = 'https://plus.character.ai/chat/user/'
+_URL_SETTINGS = 'https://plus.character.ai/chat/user/settings/'
+_URL_FOLLOWERS = 'https://plus.character.ai/chat/user/followers/'
+_URL_FOLLOWING = 'https://plus.character.ai/chat/user/following/'
+_URL_PERSONA = 'https://plus.character.ai/chat/persona/?id={}'
+_URL_PERSONAS = 'https://plus.character.ai/chat/personas/?force_refresh=1'
+_URL_CHARACTERS = 'https://plus.character.ai/chat/characters/?scope=user'
+_URL_UPVOTED_CHARACTERS = 'https://plus.character.ai/chat/user/characters/upvoted/'
+_URL_VOICES = 'https://neo.character.ai/multimodal/api/v1/voices/user'
+_URL_UPDATE_SETTINGS = 'https://plus.character.ai/chat/user/update_settings/'
+_URL_UPDATE_ACCOUNT = 'https://plus.character.ai/chat/user/update/'
+_URL_CREATE_CHARACTER = 'https://plus.character.ai/chat/character/create/'
+_URL_UPDATE_PERSONA = 'https://plus.character.ai/chat/persona/update/'
+_URL_VOICE_OVERRIDE = 'https://plus.character.ai/chat/character/{}/voice_override/{}/'
+
+_ACCOUNT_NAME_RANGE = (2, 50)
+_ACCOUNT_USERNAME_RANGE = (2, 20)
+_ACCOUNT_BIO_MAX = 500
+
+_PERSONA_NAME_RANGE = (3, 20)
+_PERSONA_SLOGAN_MAX = 50
+_PERSONA_DEFINITION_MAX = 32000
+_PERSONA_DESCRIPTION_MAX = 500
+_PERSONA_GREETING_MAX = 2048
+
+# Absorbs the common fetch -> mutate flow where edit_persona or
+# delete_persona re-fetches a persona the caller just looked up.
+_PERSONA_CACHE_TTL = 5.0
+
+_PERSONA_EDIT_DEFINITION_MAX = 728
+_PERSONA_EDIT_DESCRIPTION_MAX = 498
+_PERSONA_EDIT_GREETING_MAX = 2047
+
 
 class AccountMethods:
     def __init__(self, client, requester: Requester):
         self.__client = client
         self.__requester = requester
+        self.__body_hash_cache: Dict[str, tuple] = {}
+        self.__headers_cache: Dict[Union[str, None], Dict] = {}
+        self.__persona_cache: Dict[tuple, tuple] = {}
+
+    def __headers(self, token=None) -> Dict:
+        # Headers only depend on the token, so build the dict once per
+        # token instead of on every call. Resolve the client token first
+        # so the cache follows re-authentication instead of pinning
+        # whatever token was current on first use.
+        token = token or self.__client.get_token()
+        headers = self.__headers_cache.get(token)
+        if headers is None:
+            headers = self.__headers_cache[token] = self.__client.get_headers(token)
+        return headers
 
     async def fetch_me(self, **kwargs) -> Account:
         request = await self.__requester.request_async(
-            url='https://plus.character.ai/chat/user/',
-            options={"headers": self.__client.get_headers(kwargs.get("token", None))}
+            url=_URL_USER,
+            options={"headers": self.__headers(kwargs.get("token", None)), "cache": True}
         )
 
         if request.status_code == 200:
@@ -29,8 +82,8 @@ class AccountMethods:
 
     async def fetch_my_settings(self, **kwargs) -> Dict:
         request = await self.__requester.request_async(
-            url="https://plus.character.ai/chat/user/settings/",
-            options={"headers": self.__client.get_headers(kwargs.get("token", None))}
+            url=_URL_SETTINGS,
+            options={"headers": self.__headers(kwargs.get("token", None))}
         )
 
         if request.status_code == 200:
@@ -40,8 +93,8 @@ class AccountMethods:
 
     async def fetch_my_followers(self, **kwargs) -> List:
         request = await self.__requester.request_async(
-            url='https://plus.character.ai/chat/user/followers/',
-            options={"headers": self.__client.get_headers(kwargs.get("token", None))}
+            url=_URL_FOLLOWERS,
+            options={"headers": self.__headers(kwargs.get("token", None)), "cache": True}
         )
 
         if request.status_code == 200:
@@ -51,8 +104,8 @@ class AccountMethods:
 
     async def fetch_my_following(self, **kwargs) -> List:
         request = await self.__requester.request_async(
-            url='https://plus.character.ai/chat/user/following/',
-            options={"headers": self.__client.get_headers(kwargs.get("token", None))}
+            url=_URL_FOLLOWING,
+            options={"headers": self.__headers(kwargs.get("token", None)), "cache": True}
         )
 
         if request.status_code == 200:
@@ -61,84 +114,111 @@ class AccountMethods:
         raise FetchError('Cannot fetch your following.')
 
     async def fetch_my_persona(self, persona_id: str, **kwargs) -> Persona:
+        cache_key = (persona_id, kwargs.get("token", None))
+        cached = self.__persona_cache.get(cache_key)
+
+        if cached is not None and time.monotonic() - cached[0] < _PERSONA_CACHE_TTL:
+            return cached[1]
+
         request = await self.__requester.request_async(
-            url=f"https://plus.character.ai/chat/persona/?id={persona_id}",
-            options={"headers": self.__client.get_headers(kwargs.get("token", None))}
+            url=_URL_PERSONA.format(persona_id),
+            options={"headers": self.__headers(kwargs.get("token", None)), "cache": True}
         )
 
         if request.status_code == 200:
-            persona = request.json().get("persona", None)
-            if persona:
-                return Persona(persona)
+            raw_persona = request.json().get("persona", None)
+            if raw_persona:
+                persona = Persona(raw_persona)
+                self.__persona_cache[cache_key] = (time.monotonic(), persona)
+                return persona
 
         raise FetchError('Cannot fetch your persona. Maybe persona does not exist?')
 
     async def fetch_my_personas(self, **kwargs) -> List[Persona]:
         request = await self.__requester.request_async(
-            url="https://plus.character.ai/chat/personas/?force_refresh=1",
-            options={"headers": self.__client.get_headers(kwargs.get("token", None))}
+            url=_URL_PERSONAS,
+            options={"headers": self.__headers(kwargs.get("token", None)), "cache": True}
         )
 
         if request.status_code == 200:
-            raw_personas = request.json().get("personas", [])
-            personas = []
+            body_hash = _hash_body(request.content).digest()[:16]
+            cached = self.__body_hash_cache.get("personas")
 
-            for raw_persona in raw_personas:
-                personas.append(Persona(raw_persona))
+            if cached is not None and cached[0] == body_hash:
+                return cached[1]
 
+            personas = [Persona(raw_persona) for raw_persona in request.json().get("personas", [])]
+
+            self.__body_hash_cache["personas"] = (body_hash, personas)
             return personas
 
         raise FetchError('Cannot fetch your personas.')
 
     async def fetch_my_characters(self, **kwargs) -> List[CharacterShort]:
         request = await self.__requester.request_async(
-            url="https://plus.character.ai/chat/characters/?scope=user",
-            options={"headers": self.__client.get_headers(kwargs.get("token", None))}
+            url=_URL_CHARACTERS,
+            options={"headers": self.__headers(kwargs.get("token", None)), "cache": True}
         )
 
         if request.status_code == 200:
-            raw_characters = request.json().get("characters", [])
-            characters = []
+            body_hash = _hash_body(request.content).digest()[:16]
+            cached = self.__body_hash_cache.get("characters")
+
+            if cached is not None and cached[0] == body_hash:
+                return cached[1]
 
-            for raw_character in raw_characters:
-                characters.append(CharacterShort(raw_character))
+            characters = [CharacterShort(raw_character) for raw_character in request.json().get("characters", [])]
 
+            self.__body_hash_cache["characters"] = (body_hash, characters)
             return characters
 
         raise FetchError('Cannot fetch your characters.')
 
     async def fetch_my_upvoted_characters(self, **kwargs) -> List[CharacterShort]:
         request = await self.__requester.request_async(
-            url=f'https://plus.character.ai/chat/user/characters/upvoted/',
-            options={"headers": self.__client.get_headers(kwargs.get("token", None))}
+            url=_URL_UPVOTED_CHARACTERS,
+            options={"headers": self.__headers(kwargs.get("token", None)), "cache": True}
         )
 
         if request.status_code == 200:
-            characters_raw = request.json().get('characters', [])
-            characters = []
-
-            for character_raw in characters_raw:
-                characters.append(CharacterShort(character_raw))
-            return characters
+            return [CharacterShort(character_raw) for character_raw in request.json().get('characters', [])]
 
         raise FetchError('Cannot fetch your upvoted characters.')
 
     async def fetch_my_voices(self, **kwargs) -> List[Voice]:
         request = await self.__requester.request_async(
-            url=f"https://neo.character.ai/multimodal/api/v1/voices/user",
-            options={"headers": self.__client.get_headers(kwargs.get("token", None))}
+            url=_URL_VOICES,
+            options={"headers": self.__headers(kwargs.get("token", None)), "cache": True}
         )
 
         if request.status_code == 200:
-            raw_voices = request.json().get("voices", [])
-            voices = []
+            body_hash = _hash_body(request.content).digest()[:16]
+            cached = self.__body_hash_cache.get("voices")
 
-            for raw_voice in raw_voices:
-                voices.append(Voice(raw_voice))
+            if cached is not None and cached[0] == body_hash:
+                return cached[1]
 
+            voices = [Voice(raw_voice) for raw_voice in request.json().get("voices", [])]
+
+            self.__body_hash_cache["voices"] = (body_hash, voices)
             return voices
         raise FetchError('Cannot fetch your voices.')
 
+    async def fetch_my_social(self, **kwargs) -> Dict:
+        # The three resources are independent, so dispatch them
+        # concurrently over the shared connection pool.
+        followers, following, personas = await asyncio.gather(
+            self.fetch_my_followers(**kwargs),
+            self.fetch_my_following(**kwargs),
+            self.fetch_my_personas(**kwargs)
+        )
+
+        return {
+            "followers": followers,
+            "following": following,
+            "personas": personas
+        }
+
     async def __update_settings(self, options: Dict, **kwargs) -> Dict:
         default_persona_id = options.get("default_persona_id", None)
         persona_override = options.get("persona_override", None)
@@ -160,11 +240,11 @@ class AccountMethods:
             settings["personaOverrides"] = persona_overrides
 
         request = await self.__requester.request_async(
-            url="https://plus.character.ai/chat/user/update_settings/",
+            url=_URL_UPDATE_SETTINGS,
             options={
                 "method": 'POST',
-                "headers": self.__client.get_headers(kwargs.get("token", None)),
-                "body": json.dumps(settings)
+                "headers": self.__headers(kwargs.get("token", None)),
+                "body": settings
             }
         )
 
@@ -177,17 +257,19 @@ class AccountMethods:
         raise UpdateError('Cannot update account settings.')
 
     async def edit_account(self, name: str, username: str, bio: str = "", avatar_rel_path: str = "", **kwargs) -> bool:
-        if len(username) < 2 or len(username) > 20:
-            raise InvalidArgumentError(f"Cannot edit account info. "
-                                       f"Username must be at least 2 characters and no more than 20.")
+        username_len = len(username)
+        if not (_ACCOUNT_USERNAME_RANGE[0] <= username_len <= _ACCOUNT_USERNAME_RANGE[1]):
+            raise InvalidArgumentError("Cannot edit account info. "
+                                       "Username must be at least 2 characters and no more than 20.")
 
-        if len(name) < 2 or len(name) > 50:
-            raise InvalidArgumentError(f"Cannot edit account info. "
-                                       f"Name must be at least 2 characters and no more than 50.")
+        name_len = len(name)
+        if not (_ACCOUNT_NAME_RANGE[0] <= name_len <= _ACCOUNT_NAME_RANGE[1]):
+            raise InvalidArgumentError("Cannot edit account info. "
+                                       "Name must be at least 2 characters and no more than 50.")
 
-        if len(bio) > 500:
-            raise InvalidArgumentError(f"Cannot edit account info. "
-                                       f"Bio must be no more than 500 characters.")
+        if len(bio) > _ACCOUNT_BIO_MAX:
+            raise InvalidArgumentError("Cannot edit account info. "
+                                       "Bio must be no more than 500 characters.")
 
         new_account_info = {
             "avatar_type": "UPLOADED" if avatar_rel_path else "DEFAULT",
@@ -200,39 +282,40 @@ class AccountMethods:
             new_account_info["avatar_rel_path"] = avatar_rel_path
 
         request = await self.__requester.request_async(
-            url='https://plus.character.ai/chat/user/update/',
+            url=_URL_UPDATE_ACCOUNT,
             options={
                 "method": 'POST',
-                "headers": self.__client.get_headers(kwargs.get("token", None)),
-                "body": json.dumps(new_account_info)
+                "headers": self.__headers(kwargs.get("token", None)),
+                "body": new_account_info
             }
         )
 
         if request.status_code == 200:
-            response = request.json()
+            status = request.json().get("status", "")
 
-            if response.get("status", "") == "OK":
+            if status == "OK":
                 return True
 
-            raise EditError(f"Cannot edit account info. {response.get('status', '')}")
+            raise EditError(f"Cannot edit account info. {status}")
         raise EditError('Cannot edit account info.')
 
     async def create_persona(self, name: str, slogan: str, description: str,
                              greeting: str, definition: str, **kwargs) -> Persona:
         # Проверка длины строк и аргументов
-        if len(name) < 3 or len(name) > 20:
+        name_len = len(name)
+        if not (_PERSONA_NAME_RANGE[0] <= name_len <= _PERSONA_NAME_RANGE[1]):
             raise InvalidArgumentError("Name must be at least 3 characters and no more than 20.")
 
-        if slogan and len(slogan) > 50:
+        if slogan and len(slogan) > _PERSONA_SLOGAN_MAX:
             raise InvalidArgumentError("Slogan must be no more than 50 characters.")
 
-        if definition and len(definition) > 32000:
+        if definition and len(definition) > _PERSONA_DEFINITION_MAX:
             raise InvalidArgumentError("Definition must be no more than 32000 characters.")
 
-        if description and len(description) > 500:
+        if description and len(description) > _PERSONA_DESCRIPTION_MAX:
             raise InvalidArgumentError("Description must be no more than 500 characters.")
 
-        if greeting and len(greeting) > 2048:
+        if greeting and len(greeting) > _PERSONA_GREETING_MAX:
             raise InvalidArgumentError("Greeting must be no more than 2048 characters.")
 
         # Формирование тела запроса
@@ -256,10 +339,10 @@ class AccountMethods:
 
         try:
             request = await self.__requester.request_async(
-                url="https://plus.character.ai/chat/character/create/",
+                url=_URL_CREATE_CHARACTER,
                 options={
                     "method": 'POST',
-                    "headers": self.__client.get_headers(kwargs.get("token", None)),
+                    "headers": self.__headers(kwargs.get("token", None)),
                     "body": body
                 }
             )
@@ -282,18 +365,18 @@ class AccountMethods:
 
     async def edit_persona(self, persona_id: str, name: str = "", definition: str = "",
                            avatar_rel_path: str = "", description: str = "This is my persona.", greeting: str = "Hello",  **kwargs) -> Persona:
-        if name and (len(name) < 3 or len(name) > 20):
-            raise InvalidArgumentError(f"Cannot edit persona. "
-                                       f"Name must be at least 3 characters and no more than 20.")
-        if definition and len(definition) > 728:
-            raise InvalidArgumentError(f"Cannot edit persona. "
-                                       f"Definition must be no more than 728 characters.")
-        if description and len(description) > 498:
-            raise InvalidArgumentError(f"Cannot edit persona. "
-                                       f"Description must be no more than 498 characters.")
-        if greeting and len(greeting) > 2047:
-            raise InvalidArgumentError(f"Cannot edit persona. "
-                                       f"Greeting must be no more than 2047 characters.")
+        if name and not (_PERSONA_NAME_RANGE[0] <= len(name) <= _PERSONA_NAME_RANGE[1]):
+            raise InvalidArgumentError("Cannot edit persona. "
+                                       "Name must be at least 3 characters and no more than 20.")
+        if definition and len(definition) > _PERSONA_EDIT_DEFINITION_MAX:
+            raise InvalidArgumentError("Cannot edit persona. "
+                                       "Definition must be no more than 728 characters.")
+        if description and len(description) > _PERSONA_EDIT_DESCRIPTION_MAX:
+            raise InvalidArgumentError("Cannot edit persona. "
+                                       "Description must be no more than 498 characters.")
+        if greeting and len(greeting) > _PERSONA_EDIT_GREETING_MAX:
+            raise InvalidArgumentError("Cannot edit persona. "
+                                       "Greeting must be no more than 2047 characters.")
 
         try:
             old_persona = await self.fetch_my_persona(persona_id, **kwargs)
@@ -326,13 +409,15 @@ class AccountMethods:
             payload["avatar_rel_path"] = avatar_rel_path
 
         request = await self.__requester.request_async(
-            url=f"https://plus.character.ai/chat/persona/update/",
+            url=_URL_UPDATE_PERSONA,
             options={
                 "method": 'POST',
-                "headers": self.__client.get_headers(kwargs.get("token", None)),
+                "headers": self.__headers(kwargs.get("token", None)),
                 "body": payload
             }
         )
+        self.__persona_cache.pop((persona_id, kwargs.get("token", None)), None)
+
         response = request.json()
         if request.status_code == 200:
 
@@ -369,21 +454,22 @@ class AccountMethods:
         }
 
         request = await self.__requester.request_async(
-            url=f"https://plus.character.ai/chat/persona/update/",
+            url=_URL_UPDATE_PERSONA,
             options={
                 "method": 'POST',
-                "headers": self.__client.get_headers(kwargs.get("token", None)),
-                "body": json.dumps(payload)
+                "headers": self.__headers(kwargs.get("token", None)),
+                "body": payload
             }
         )
+        self.__persona_cache.pop((persona_id, kwargs.get("token", None)), None)
 
+        response = request.json()
         if request.status_code == 200:
-            response = request.json()
             if response.get("status", None) == "OK" and response.get("persona", None) is not None:
                 return True
 
             raise DeleteError(f"Cannot delete persona. {response.get('error', '')}")
-        raise DeleteError(f"Cannot delete persona. {request.json()}")
+        raise DeleteError(f"Cannot delete persona. {response}")
 
     async def set_default_persona(self, persona_id: Union[str, None], **kwargs) -> bool:
         try:
@@ -418,11 +504,11 @@ class AccountMethods:
         method = "update" if voice_id else "delete"
 
         request = await self.__requester.request_async(
-            url=f"https://plus.character.ai/chat/character/{character_id}/voice_override/{method}/",
+            url=_URL_VOICE_OVERRIDE.format(character_id, method),
             options={
                 "method": 'POST',
-                "headers": self.__client.get_headers(kwargs.get("token", None)),
-                "body": json.dumps({"voice_id": voice_id}) if voice_id else None
+                "headers": self.__headers(kwargs.get("token", None)),
+                "body": {"voice_id": voice_id} if voice_id else None
             }
         )
 
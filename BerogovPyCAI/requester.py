@@ -1,5 +1,6 @@
 import asyncio
 import json
+from collections import deque
 from typing import Dict, AsyncGenerator, Optional
 
 import httpx  # for requests
@@ -8,26 +9,65 @@ from aiohttp import WSMsgType, WSServerHandshakeError
 
 from .exceptions import RequestError, AuthenticationError
 
+try:
+    import orjson
+
+    def json_dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+
+    json_loads = orjson.loads
+except ImportError:
+    def json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+    json_loads = json.loads
+
+try:
+    import simdjson
+
+    # A single parser instance is reusable; recursive=True materializes
+    # plain Python objects so nothing references the parser's buffer.
+    _simdjson_parser = simdjson.Parser()
+
+    def _parse_response_body(content: bytes):
+        return _simdjson_parser.parse(content, recursive=True)
+except ImportError:
+    _parse_response_body = json_loads
+
+_JSON_METHODS = frozenset({"POST", "PUT", "PATCH"})
+
 
 class Requester:
     def __init__(self, **kwargs):
         self.__extra_options = kwargs
         self.__proxy: Optional[str] = self.__extra_options.pop("proxy", None)
         self.__http_client: Optional[httpx.AsyncClient] = None
+        self.__etag_cache: Dict[tuple, tuple] = {}
         self.__ws_sessions: Dict[str, 'Requester.WebsocketSession'] = {}
 
     class Response:
-        def __init__(self, url: str, status_code: int, text: str, content: bytes):
+        def __init__(self, url: str, status_code: int, content: bytes):
             self.url: str = url
             self.status_code: int = status_code
-            self.text: str = text
             self.content: bytes = content
+            self.__parsed = None
+
+        @property
+        def text(self) -> str:
+            return self.content.decode("utf-8", errors="replace")
 
         def json(self):
-            return json.loads(self.text)
+            if self.__parsed is None:
+                self.__parsed = _parse_response_body(self.content)
+            return self.__parsed
 
     async def requests_session_init(self) -> None:
-        self.__http_client = httpx.AsyncClient()        
+        self.__http_client = httpx.AsyncClient(
+            proxy=self.__proxy,
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0),
+            timeout=httpx.Timeout(30.0, connect=10.0)
+        )
 
     async def requests_session_close_async(self) -> None:
         if self.__http_client is not None:
@@ -37,39 +77,51 @@ class Requester:
         if options is None:
             options = {}
 
+        if self.__http_client is None:
+            await self.requests_session_init()
+
         method = options.get("method", "GET")
         headers = options.get("headers", {})
         body = options.get("body", None)
 
-        raw_response: Optional[httpx.Response] = None
-
-        try:
-            if method == "GET":
-                raw_response = await self.__http_client.get(url, headers=headers)
+        use_cache = method == "GET" and options.get("cache", False)
+        cache_key = None
+        cached = None
 
-            elif method == "POST":
-                raw_response = await self.__http_client.post(url, headers=headers, json=body)
+        if use_cache:
+            cache_key = (url, headers.get("authorization", ""))
+            cached = self.__etag_cache.get(cache_key)
 
-            elif method == "PUT":
-                raw_response = await self.__http_client.put(url, headers=headers, json=body)
+            if cached is not None:
+                headers = {**headers, "If-None-Match": cached[0]}
 
-            elif method == "PATCH":
-                raw_response = await self.__http_client.patch(url, headers=headers, json=body)
-
-            elif method == "DELETE":
-                raw_response = await self.__http_client.delete(url, headers=headers)
-
-            if raw_response is None:
-                raise RequestError("No response received.")
+        body_kwargs = {}
+        if method in _JSON_METHODS and body is not None:
+            # Dict bodies are serialized here with orjson; pre-serialized
+            # str/bytes bodies are sent verbatim. Either way httpx gets
+            # ready-made content and never re-serializes.
+            body_kwargs = {"content": body if isinstance(body, (bytes, str)) else json_dumps(body)}
 
+        try:
+            raw_response = await self.__http_client.request(method, url, headers=headers, **body_kwargs)
         except httpx.RequestError as e:
             raise RequestError(f"An error occurred while making the request: {str(e)}")
 
-        response = self.Response(url, raw_response.status_code, raw_response.text, raw_response.content)
+        if cached is not None and raw_response.status_code == 304:
+            # Not modified: reuse the previous response (and its already
+            # parsed body) instead of re-downloading and re-parsing.
+            return cached[1]
+
+        response = self.Response(url, raw_response.status_code, raw_response.content)
 
         if response.status_code == 401:
             raise AuthenticationError("Maybe your token is invalid?")
 
+        if use_cache and response.status_code == 200:
+            etag = raw_response.headers.get("etag")
+            if etag:
+                self.__etag_cache[cache_key] = (etag, response)
+
         return response
 
     class WebsocketSession:
@@ -82,22 +134,43 @@ class Requester:
             self.ws: Optional[aiohttp.ClientWebSocketResponse] = None
             self.all_sessions: Dict[str, 'Requester.WebsocketSession'] = all_sessions
             self.response_messages_queue: asyncio.Queue = asyncio.Queue()
-            self.response_messages: Dict[str, Dict] = {}
+            self.response_messages: Dict[str, deque] = {}
             self.receiving: bool = False
             self.receiver_task: Optional[asyncio.Task] = None
             self.in_use: bool = False
             self.deletion_timeout: float = deletion_timeout
             self.deletion_task: Optional[asyncio.Task] = None
-            self.all_sessions[self.session_uuid] = self
 
         @staticmethod
         async def get_session(all_sessions: Dict, token: str, additional_uuid: Optional[str] = None, proxy: Optional[str] = None, deletion_timeout: float = 60.0):
             session_id = f"{token}:{additional_uuid}"
             session = all_sessions.get(session_id, None)
 
-            if not session:
+            if isinstance(session, asyncio.Future):
+                # Another caller is mid-handshake for the same session;
+                # share its result instead of opening a second socket.
+                return await session
+
+            if session:
+                return session
+
+            future = asyncio.get_running_loop().create_future()
+            all_sessions[session_id] = future
+
+            try:
                 session = Requester.WebsocketSession(all_sessions=all_sessions, token=token, additional_uuid=additional_uuid, proxy=proxy, deletion_timeout=deletion_timeout)
                 await session.init()
+            except BaseException as e:
+                all_sessions.pop(session_id, None)
+                future.set_exception(e)
+                # Mark the exception retrieved: with no concurrent
+                # waiters nobody awaits this future, and asyncio would
+                # log "exception was never retrieved" at GC.
+                future.exception()
+                raise
+
+            all_sessions[session_id] = session
+            future.set_result(session)
             return session
 
         async def init(self) -> None:
@@ -162,12 +235,15 @@ class Requester:
                 self.deletion_task = None
 
         async def __receiver(self) -> None:
+            # Bind the hot names locally; this loop runs once per frame
+            # of a token-by-token chat stream.
+            loads = json_loads
+            enqueue = self.response_messages_queue.put_nowait
+
             while self.receiving:
                 response = await self.ws.receive()
                 if response.type is WSMsgType.TEXT:
-                    response_str = response.data
-                    response_json = json.loads(response_str)
-                    self.response_messages_queue.put_nowait(response_json)
+                    enqueue(loads(response.data))
                 elif response.type in (WSMsgType.CLOSE, WSMsgType.CLOSING, WSMsgType.CLOSED):
                     await self.delete()
                     raise RequestError("Connection was closed by server")
@@ -193,7 +269,10 @@ class Requester:
                 self.receiver_task.add_done_callback(self.__receiver_result_handler)
 
             try:
-                await self.ws.send_json(message)
+                # send_json defaults to stdlib json.dumps and ignores the
+                # session serializer; aiohttp expects a str back, hence
+                # the decode.
+                await self.ws.send_json(message, dumps=lambda obj: json_dumps(obj).decode())
             except ConnectionResetError:
                 raise RequestError
 
@@ -203,18 +282,18 @@ class Requester:
             try:
                 while True:
                     if request_uuid is not None:
-                        saved_messages = self.response_messages.get(request_uuid, [])
+                        saved_messages = self.response_messages.get(request_uuid)
                         if saved_messages:
-                            message = saved_messages.pop(0)
-                            self.response_messages[request_uuid] = saved_messages
+                            message = saved_messages.popleft()
                             yield message
                             self.schedule_deletion()
                             continue
 
-                    try:
-                        current_response = await asyncio.wait_for(self.response_messages_queue.get(), 5)
-                    except asyncio.TimeoutError:
-                        continue
+                    # The queue wakes us as soon as the receiver task
+                    # enqueues a frame; no timeout polling is needed, the
+                    # buffered-message check above only matters after a
+                    # frame has actually arrived.
+                    current_response = await self.response_messages_queue.get()
 
                     command = current_response.get("command", None)
                     if command in [None, "ok"] and request_uuid is None:
@@ -222,9 +301,10 @@ class Requester:
                         self.schedule_deletion()
                         break
 
-                    messages = self.response_messages.get(request_uuid, [])
+                    messages = self.response_messages.get(request_uuid)
+                    if messages is None:
+                        messages = self.response_messages[request_uuid] = deque()
                     messages.append(current_response)
-                    self.response_messages[request_uuid] = messages
 
             finally:
                 if request_uuid:
@@ -241,6 +321,12 @@ class Requester:
 
     async def ws_close(self, session_uuid: str):
         session = self.__ws_sessions.get(session_uuid, None)
+        if isinstance(session, asyncio.Future):
+            try:
+                session = await session
+            except Exception:
+                return
+
         if session:
             await session.delete()
 
@@ -18,8 +18,17 @@ setup(
     packages=find_packages(),
     install_requires=[
         'httpx',
-        'aiohttp'
+        'aiohttp',
+        'h2',
+        'orjson'
     ],
+    extras_require={
+        'fast': [
+            'blake3',
+            'pysimdjson',
+            "uvloop; platform_system != 'Windows'"
+        ]
+    },
     classifiers=[
         'Programming Language :: Python :: 3.8',
         'Programming Language :: Python :: 3.9',